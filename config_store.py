@@ -0,0 +1,127 @@
+import os
+import copy
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows - fall back to the in-process lock only
+    fcntl = None
+
+
+class ConfigStore:
+    """
+    Shared access to config.json.
+    Reads are cached in memory and only re-parsed when the file's (inode, mtime, size) stamp changes.
+    Writes take an exclusive lock and replace the file atomically.
+    """
+
+    def __init__(self, config_path="config.json"):
+        self.config_path = Path(config_path)
+        self.lock_path = self.config_path.with_name(self.config_path.name + ".lock")
+        self.config_path.parent.mkdir(parents=True, exist_ok=True)
+        self._cache = None
+        self._cache_stamp = None
+        self._thread_lock = threading.RLock()
+
+    def _stamp(self):
+        """Return an (inode, mtime_ns, size) stamp for the config file, or None if missing"""
+        try:
+            st = os.stat(self.config_path)
+        except FileNotFoundError:
+            return None
+        # os.replace always gives the file a new inode, so same-size rewrites
+        # are detected even where mtime is too coarse to change
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    @contextmanager
+    def _locked(self, exclusive):
+        """Hold the thread lock and, where available, an fcntl lock on the lock file"""
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_file(self):
+        """Parse the config file, returning {} if it is missing or corrupt"""
+        try:
+            with open(self.config_path, 'r') as f:
+                config = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return config if isinstance(config, dict) else {}
+
+    def _refresh(self):
+        """Reload the cache if the file changed since it was last read"""
+        stamp = self._stamp()
+        if self._cache is None or stamp != self._cache_stamp:
+            self._cache = self._read_file() if stamp is not None else {}
+            self._cache_stamp = stamp
+
+    def load(self):
+        """Return a deep copy of the whole config, so callers can't change the cache by accident"""
+        with self._thread_lock:
+            if self._cache is None or self._stamp() != self._cache_stamp:
+                with self._locked(exclusive=False):
+                    self._refresh()
+            return copy.deepcopy(self._cache)
+
+    def get(self, key, default=None):
+        """Return a single config value"""
+        return self.load().get(key, default)
+
+    def modify(self, func):
+        """
+        Read-modify-write the config under the exclusive lock.
+        func receives a copy of the config to change in place; its return value is passed back.
+        The file is only rewritten if func changed something.
+        """
+        with self._locked(exclusive=True):
+            # Re-check under the lock so concurrent writers don't lose each other's keys
+            self._refresh()
+            config = copy.deepcopy(self._cache)
+            result = func(config)
+            if config != self._cache:
+                self._write_atomic(config)
+                self._cache = config
+                self._cache_stamp = self._stamp()
+        return result
+
+    def update(self, **values):
+        """Merge values into the config and write it back atomically"""
+        return self.modify(lambda config: config.update(values) or dict(config))
+
+    def set(self, key, value):
+        """Set a single config value"""
+        return self.update(**{key: value})
+
+    def _write_atomic(self, config):
+        """Write config to a temp file in the same directory and rename it into place"""
+        import tempfile  # Only writers pay for tempfile and the random/hashlib it imports
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=str(self.config_path.parent),
+            prefix=self.config_path.name + ".",
+            suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(config, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.config_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
@@ -1,40 +1,20 @@
-import os
-import json
 from datetime import datetime
-from pathlib import Path
+
+from config_store import ConfigStore
 
 
 class DateChecker:
-    def __init__(self, config_path="config.json"):
+    def __init__(self, config_path="config.json", config_store=None):
         self.config_path = config_path
-        self.config_dir = Path(config_path).parent
-        self.config_dir.mkdir(exist_ok=True)
+        self.config_store = config_store or ConfigStore(config_path)
 
     def load_last_run_date(self):
-        """Load the last run date from config file"""
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
-                    return config.get('last_run_date')
-            except:
-                return None
-        return None
+        """Load the last run date from the cached config"""
+        return self.config_store.get('last_run_date')
 
     def save_last_run_date(self, date_str):
         """Save the current date to config file"""
-        config = {}
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
-            except:
-                pass
-
-        config['last_run_date'] = date_str
-
-        with open(self.config_path, 'w') as f:
-            json.dump(config, f, indent=4)
+        self.config_store.set('last_run_date', date_str)
 
     def has_date_changed(self):
         """Check if the date has changed since last run"""
@@ -48,4 +28,4 @@ class DateChecker:
     def update_date(self):
         """Update the last run date to today"""
         current_date = datetime.now().strftime('%Y-%m-%d')
-        self.save_last_run_date(current_date)
\ No newline at end of file
+        self.save_last_run_date(current_date)
@@ -3,14 +3,20 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 
+from metrics import RunMetrics
+from throttle import Throttle
+
 
 class DesktopOrganizer:
-    def __init__(self, desktop_path=None):
+    def __init__(self, desktop_path=None, throttle=None):
         if desktop_path is None:
             self.desktop_path = Path.home() / "Desktop"
         else:
             self.desktop_path = Path(desktop_path)
 
+        # Rate limits for mkdir/move calls; unlimited by default
+        self.throttle = throttle or Throttle()
+
         # Define organization categories
         self.categories = {
             'Images': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.ico', '.webp'],
@@ -31,35 +37,63 @@ class DesktopOrganizer:
                 return category
         return 'Others'
 
-    def organize_by_extension(self):
-        """Organize files by their extensions into folders"""
+    def _make_dir(self, path, throttle, metrics):
+        """Create a target folder, counting it against the ops limit only if it is new"""
+        if not path.exists():
+            metrics.record_wait(throttle.operation())
+        path.mkdir(exist_ok=True)
+
+    def _move_file(self, file, destination, throttle, metrics):
+        """Move a file; with a bytes limit, cross-device moves are copied in throttled chunks"""
+        metrics.record_wait(throttle.operation())
+        src_stat = file.stat()
+        cross_device = src_stat.st_dev != destination.parent.stat().st_dev
+        if cross_device:
+            metrics.count('cross_device_moves')
+
+        if cross_device and throttle.effective_bytes_per_sec:
+            metrics.record_wait(throttle.copy_file(file, destination))
+            file.unlink()
+        else:
+            shutil.move(str(file), str(destination))
+        metrics.count('files')
+        metrics.count('bytes', src_stat.st_size)
+
+    def _organize(self, folder_for, throttle, metrics):
+        """Move every file in the desktop into the folder named by folder_for(file)"""
         moved_files = []
+        throttle = throttle or self.throttle
+        metrics = metrics or RunMetrics()
 
         try:
             # Get all files in desktop (not folders)
-            files = [f for f in self.desktop_path.iterdir() if f.is_file()]
+            with metrics.phase('scan'):
+                files = [f for f in self.desktop_path.iterdir() if f.is_file()]
 
             for file in files:
-                file_ext = file.suffix
-                category = self.get_category(file_ext)
-
-                # Create category folder if it doesn't exist
-                category_path = self.desktop_path / category
-                category_path.mkdir(exist_ok=True)
+                with metrics.phase('classify'):
+                    category = folder_for(file)
 
-                # Move file to category folder
-                destination = category_path / file.name
+                with metrics.phase('move'):
+                    # Create category folder if it doesn't exist
+                    category_path = self.desktop_path / category
+                    self._make_dir(category_path, throttle, metrics)
 
                 # Handle duplicate names
-                counter = 1
-                original_dest = destination
-                while destination.exists():
-                    stem = original_dest.stem
-                    suffix = original_dest.suffix
-                    destination = category_path / f"{stem}_{counter}{suffix}"
-                    counter += 1
-
-                shutil.move(str(file), str(destination))
+                with metrics.phase('collision_resolve'):
+                    destination = category_path / file.name
+                    counter = 1
+                    original_dest = destination
+                    while destination.exists():
+                        stem = original_dest.stem
+                        suffix = original_dest.suffix
+                        destination = category_path / f"{stem}_{counter}{suffix}"
+                        counter += 1
+                        metrics.count('retries')
+
+                with metrics.phase('move'):
+                    self._move_file(file, destination, throttle, metrics)
+
                 moved_files.append({
                     'file': file.name,
                     'from': str(self.desktop_path),
@@ -73,77 +107,66 @@ class DesktopOrganizer:
         except Exception as e:
             return False, str(e)
 
-    def organize_by_name(self, prefix_length=1):
-        """Organize files alphabetically by first letter(s) of filename"""
-        moved_files = []
-
-        try:
-            files = [f for f in self.desktop_path.iterdir() if f.is_file()]
-
-            for file in files:
-                prefix = file.stem[:prefix_length].upper()
-                if not prefix.isalnum():
-                    prefix = "Special"
-
-                prefix_path = self.desktop_path / f"Name_{prefix}"
-                prefix_path.mkdir(exist_ok=True)
-
-                destination = prefix_path / file.name
-                counter = 1
-                original_dest = destination
-                while destination.exists():
-                    stem = original_dest.stem
-                    suffix = original_dest.suffix
-                    destination = prefix_path / f"{stem}_{counter}{suffix}"
-                    counter += 1
-
-                shutil.move(str(file), str(destination))
-                moved_files.append({
-                    'file': file.name,
-                    'from': str(self.desktop_path),
-                    'to': str(destination),
-                    'category': f"Name_{prefix}",
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                })
+    def organize_by_extension(self, throttle=None, metrics=None):
+        """Organize files by their extensions into folders"""
+        return self._organize(lambda file: self.get_category(file.suffix), throttle, metrics)
 
-            return True, moved_files
+    def organize_by_name(self, prefix_length=1, throttle=None, metrics=None):
+        """Organize files alphabetically by first letter(s) of filename"""
+        def folder_for(file):
+            prefix = file.stem[:prefix_length].upper()
+            if not prefix.isalnum():
+                prefix = "Special"
+            return f"Name_{prefix}"
 
-        except Exception as e:
-            return False, str(e)
+        return self._organize(folder_for, throttle, metrics)
 
-    def organize_by_date(self):
+    def organize_by_date(self, throttle=None, metrics=None):
         """Organize files by their modification date"""
-        moved_files = []
+        def folder_for(file):
+            mod_time = datetime.fromtimestamp(file.stat().st_mtime)
+            return f"Date_{mod_time.strftime('%Y-%m')}"
+
+        return self._organize(folder_for, throttle, metrics)
+
+    def undo_moves(self, moved_files, throttle=None, metrics=None):
+        """
+        Move files from a logged organize run back to where they came from.
+        Each restored detail is flagged 'undone' in place, so a partial undo can be resumed.
+        Files deleted since the run can never come back and are flagged 'missing' instead;
+        files whose original location is taken are left unflagged to retry later.
+        """
+        restored = []
+        throttle = throttle or self.throttle
+        metrics = metrics or RunMetrics()
 
         try:
-            files = [f for f in self.desktop_path.iterdir() if f.is_file()]
-
-            for file in files:
-                mod_time = datetime.fromtimestamp(file.stat().st_mtime)
-                date_folder = mod_time.strftime('%Y-%m')
-
-                date_path = self.desktop_path / f"Date_{date_folder}"
-                date_path.mkdir(exist_ok=True)
-
-                destination = date_path / file.name
-                counter = 1
-                original_dest = destination
-                while destination.exists():
-                    stem = original_dest.stem
-                    suffix = original_dest.suffix
-                    destination = date_path / f"{stem}_{counter}{suffix}"
-                    counter += 1
-
-                shutil.move(str(file), str(destination))
-                moved_files.append({
-                    'file': file.name,
-                    'from': str(self.desktop_path),
+            for detail in reversed(moved_files):
+                if detail.get('undone') or detail.get('missing'):
+                    continue
+
+                source = Path(detail['to'])
+                destination = Path(detail['from']) / detail['file']
+
+                if not source.is_file():
+                    detail['missing'] = True
+                    continue
+                if destination.exists():
+                    continue
+
+                with metrics.phase('move'):
+                    self._move_file(source, destination, throttle, metrics)
+                detail['undone'] = True
+
+                restored.append({
+                    'file': detail['file'],
+                    'from': str(source.parent),
                     'to': str(destination),
-                    'category': f"Date_{date_folder}",
+                    'category': 'Undo',
                     'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 })
 
-            return True, moved_files
+            return True, restored
 
         except Exception as e:
             return False, str(e)
\ No newline at end of file
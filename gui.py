@@ -10,6 +10,7 @@ try:
     from date_checker import DateChecker
     from desktop_organizer import DesktopOrganizer
     from log_manager import LogManager
+    from metrics import RunMetrics
 except ImportError:
     messagebox.showerror("Import Error",
                          "Could not find required modules (date_checker.py, desktop_organizer.py, log_manager.py). Please ensure they are in the same folder.")
@@ -60,6 +61,10 @@ class DesktopOrganizerGUI:
             self.root.destroy()
             return
 
+        # Hidden diagnostics toggle: Ctrl+Shift+P profiles the next organize run
+        self.profile_next_run = False
+        self.root.bind("<Control-Shift-P>", self.toggle_profiling)
+
         self.setup_ui()
         self.load_today_log()
         # Check date after UI is built
@@ -256,19 +261,34 @@ class DesktopOrganizerGUI:
         except Exception as e:
             self.status_label.config(text=f"Date check failed: {e}", fg=self.COLOR_ERROR)
 
+    def toggle_profiling(self, event=None):
+        """Toggle profiling of the next organization run."""
+        self.profile_next_run = not self.profile_next_run
+        state = "enabled" if self.profile_next_run else "disabled"
+        self.status_label.config(text=f"Profiling {state} for next run", fg=self.COLOR_TEXT_MUTED)
+
     def _run_organization(self, org_function, org_type_name):
         """Helper function to run any organization task."""
         self.status_label.config(text=f"Organizing by {org_type_name}...", fg=self.COLOR_TEXT)
         self.root.update()
 
+        metrics = RunMetrics()
+        profiler = None
         try:
-            success, result = org_function()
+            if self.profile_next_run:
+                self.profile_next_run = False
+                from profiling import RunProfiler
+                with RunProfiler(self.log_manager.log_dir, label=org_type_name) as profiler:
+                    success, result = org_function(metrics=metrics)
+            else:
+                success, result = org_function(metrics=metrics)
 
             if success:
                 log_entry = self.log_manager.create_log_entry(
                     org_type_name,
                     result,
-                    success=True
+                    success=True,
+                    metrics=metrics
                 )
                 self.log_manager.save_log(log_entry)
 
@@ -278,7 +298,10 @@ class DesktopOrganizerGUI:
                     self.last_run_label.config(text=f"Last Run: {datetime.now().strftime('%Y-%m-%d')}")
 
                 self.status_label.config(text=f"Success! Organized {len(result)} files.", fg=self.COLOR_SUCCESS)
-                messagebox.showinfo("Success", f"Successfully organized {len(result)} files!")
+                message = f"Successfully organized {len(result)} files!"
+                if profiler is not None:
+                    message += f"\n\nProfile written to:\n{profiler.prof_path}\n{profiler.report_path}"
+                messagebox.showinfo("Success", message)
 
             else:
                 # 'result' is an error message on failure
@@ -289,7 +312,8 @@ class DesktopOrganizerGUI:
                 org_type_name,
                 [],
                 success=False,
-                error_message=str(e)
+                error_message=str(e),
+                metrics=metrics
             )
             self.log_manager.save_log(log_entry)
             self.status_label.config(text="Organization failed!", fg=self.COLOR_ERROR)
@@ -11,8 +11,8 @@ class LogManager:
         self.current_date = datetime.now().strftime('%Y-%m-%d')
         self.log_file = self.log_dir / f"organization_log_{self.current_date}.json"
 
-    def create_log_entry(self, organization_type, moved_files, success=True, error_message=None):
-        """Create a log entry for an organization operation"""
+    def create_log_entry(self, organization_type, moved_files, success=True, error_message=None, metrics=None):
+        """Create a log entry for an organization operation, with optional run metrics"""
         log_entry = {
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'organization_type': organization_type,
@@ -22,6 +22,9 @@ class LogManager:
             'error': error_message if not success else None
         }
 
+        if metrics is not None:
+            log_entry['metrics'] = metrics.as_dict()
+
         return log_entry
 
     def save_log(self, log_entry):
@@ -45,6 +48,28 @@ class LogManager:
 
         return True
 
+    def get_last_undoable(self, date=None):
+        """Find the most recent successful run that moved files and has not been undone"""
+        logs = self.get_daily_log(date)
+
+        for index in range(len(logs) - 1, -1, -1):
+            log = logs[index]
+            if (log.get('success') and log.get('details') and not log.get('undone')
+                    and not log.get('organization_type', '').startswith('Undo')):
+                return index, log
+        return None, None
+
+    def update_entry(self, index, log_entry, date=None):
+        """Replace an existing log entry, e.g. to record undo progress"""
+        log_file = self.log_dir / f"organization_log_{date or self.current_date}.json"
+        logs = self.get_daily_log(date)
+        logs[index] = log_entry
+
+        with open(log_file, 'w') as f:
+            json.dump(logs, f, indent=4)
+
+        return True
+
     def get_daily_log(self, date=None):
         """Retrieve log for a specific date"""
         if date is None:
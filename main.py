@@ -1,72 +1,267 @@
 """
 Desktop Organizer - Main Scheduler
-This script runs in the background and automatically organizes desktop when date changes
+This script runs in the background and automatically organizes desktop when date changes.
+Additional roots and cron/interval triggers can be configured under "schedules" in config.json.
+The top-level "throttle" limits are shared by all jobs; a job's own "throttle" block can only
+make that job stricter. "low_priority" is read from the top-level block only, since it applies
+to the whole process.
 """
 
-import time
-import schedule
-from date_checker import DateChecker
+import argparse
+import asyncio
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from config_store import ConfigStore
 from desktop_organizer import DesktopOrganizer
 from log_manager import LogManager
+from metrics import MetricsExporter, RunMetrics
+from throttle import Throttle, lower_process_priority
+from triggers import trigger_from_config
+
+
+# Organizer method and log label for each scheduled organize mode
+ORGANIZE_MODES = {
+    'extension': ('organize_by_extension', "Auto Organize (Scheduled)"),
+    'name': ('organize_by_name', "Auto Organize by Name (Scheduled)"),
+    'date': ('organize_by_date', "Auto Organize by Date (Scheduled)"),
+}
+
+# Used when config.json has no "schedules": hourly date-change check of the Desktop
+DEFAULT_SCHEDULE = {
+    'name': 'desktop',
+    'interval': 3600,
+    'run_on_start': True,
+    'mode': 'extension',
+    'on_date_change': True,
+}
+
+
+class ScheduledJob:
+    def __init__(self, job_config, shared_throttle=None):
+        self.name = job_config.get('name') or job_config.get('path') or 'desktop'
+        self.mode = job_config.get('mode', 'extension')
+        if self.mode not in ORGANIZE_MODES:
+            raise ValueError(f"Unknown organize mode for job '{self.name}': {self.mode}")
+
+        # Build and try the trigger once so bad config fails at startup, not mid-run
+        try:
+            self.trigger = trigger_from_config(job_config)
+            now = datetime.now()
+            self.trigger.next_fire(now, now)
+        except ValueError as e:
+            raise ValueError(f"Invalid schedule for job '{self.name}': {e}") from None
+        self.on_date_change = job_config.get('on_date_change', False)
+        # The job's own "throttle" block is layered on the scheduler-wide throttle,
+        # so the global limits cap all jobs together and a job can only be stricter
+        shared_throttle = shared_throttle or Throttle()
+        job_throttle = job_config.get('throttle')
+        if job_throttle:
+            try:
+                self.throttle = Throttle.from_config(job_throttle, parent=shared_throttle)
+            except ValueError as e:
+                raise ValueError(f"Invalid throttle for job '{self.name}': {e}") from None
+        else:
+            self.throttle = shared_throttle
+        # Resolve the root so logged from/to paths (and undo) don't depend on the working directory
+        path = job_config.get('path')
+        path = Path(path).expanduser().resolve() if path else None
+        self.organizer = DesktopOrganizer(path, throttle=self.throttle)
+        self.root_key = str(Path(self.organizer.desktop_path).resolve())
+
+        # The Desktop keeps the legacy "last_run_date" key that the GUI shows;
+        # every other root gets its own entry under "last_run_dates"
+        self.uses_legacy_date = job_config.get('path') is None
 
 
 class DesktopOrganizerScheduler:
-    def __init__(self):
-        self.date_checker = DateChecker()
-        self.organizer = DesktopOrganizer()
-        self.log_manager = LogManager()
-
-    def auto_organize(self):
-        """Automatically organize desktop if date has changed"""
-        changed, current_date = self.date_checker.has_date_changed()
-
-        if changed:
-            print(f"Date changed to {current_date}. Starting organization...")
-
-            # Organize by extension
-            success, result = self.organizer.organize_by_extension()
-
-            # Log the operation
-            if success:
-                log_entry = self.log_manager.create_log_entry(
-                    "Auto Organize (Scheduled)",
-                    result,
-                    success=True
-                )
-                print(f"Successfully organized {len(result)} files")
+    def __init__(self, config_path="config.json", throttle_overrides=None, profile=False, log_dir="logs"):
+        self.config_store = ConfigStore(config_path)
+        self.log_manager = LogManager(log_dir)
+        self._log_lock = threading.Lock()
+
+        metrics_config = self.config_store.get('metrics') or {}
+        self.metrics_exporter = MetricsExporter(metrics_config.get('textfile'))
+        self.metrics_port = metrics_config.get('http_port')
+
+        schedules = self.config_store.get('schedules') or [DEFAULT_SCHEDULE]
+        # One throttle for the whole process: the top-level "throttle" block plus
+        # per-run overrides. low_priority is only read here, since it applies to the process
+        try:
+            self.throttle = Throttle.from_config(self.config_store.get('throttle'), throttle_overrides)
+        except ValueError as e:
+            raise ValueError(f"Invalid throttle settings: {e}") from None
+        self.jobs = [ScheduledJob(job_config, self.throttle) for job_config in schedules]
+
+        self._root_locks = {}
+        self._stop_event = None
+
+        # When set, the next run that actually organizes is profiled, then the flag clears
+        self.profile_next_run = profile
+        self._profile_lock = threading.Lock()
+
+    def _claim_date_change(self, job):
+        """Atomically check whether the job's root already ran today and record today's run if not"""
+        current_date = datetime.now().strftime('%Y-%m-%d')
+
+        def claim(config):
+            if job.uses_legacy_date:
+                if config.get('last_run_date') == current_date:
+                    return False
+                config['last_run_date'] = current_date
             else:
-                log_entry = self.log_manager.create_log_entry(
-                    "Auto Organize (Scheduled)",
-                    [],
-                    success=False,
-                    error_message=result
-                )
-                print(f"Organization failed: {result}")
+                dates = config.setdefault('last_run_dates', {})
+                if dates.get(job.root_key) == current_date:
+                    return False
+                dates[job.root_key] = current_date
+            return True
 
-            self.log_manager.save_log(log_entry)
+        return self.config_store.modify(claim), current_date
+
+    def auto_organize(self, job=None):
+        """Organize a job's root, gated on a date change for jobs that ask for it"""
+        job = job or self.jobs[0]
 
-            # Update last run date
-            self.date_checker.update_date()
+        if job.on_date_change:
+            # Claiming up front keeps jobs that fire together from both running;
+            # like before, a failed run still counts as the day's run
+            changed, current_date = self._claim_date_change(job)
+            if not changed:
+                print(f"[{job.name}] No date change detected. Last run: {current_date}")
+                return
+            print(f"[{job.name}] Date changed to {current_date}. Starting organization...")
         else:
-            print(f"No date change detected. Last run: {current_date}")
+            print(f"[{job.name}] Triggered ({job.trigger}). Starting organization...")
+
+        method_name, log_label = ORGANIZE_MODES[job.mode]
+        metrics = RunMetrics()
+        organize = getattr(job.organizer, method_name)
+
+        with self._profile_lock:
+            profile, self.profile_next_run = self.profile_next_run, False
+
+        if profile:
+            from profiling import RunProfiler
+            with RunProfiler(self.log_manager.log_dir, label=job.name) as profiler:
+                success, result = organize(metrics=metrics)
+            print(f"[{job.name}] Profile written to {profiler.prof_path} and {profiler.report_path}")
+        else:
+            success, result = organize(metrics=metrics)
+
+        # Log the operation
+        if success:
+            log_entry = self.log_manager.create_log_entry(
+                log_label,
+                result,
+                success=True,
+                metrics=metrics
+            )
+            print(f"[{job.name}] Successfully organized {len(result)} files")
+        else:
+            log_entry = self.log_manager.create_log_entry(
+                log_label,
+                [],
+                success=False,
+                error_message=result,
+                metrics=metrics
+            )
+            print(f"[{job.name}] Organization failed: {result}")
+
+        # log_write is timed after the entry is built, so it only shows up in the exporter
+        with self._log_lock, metrics.phase('log_write'):
+            self.log_manager.save_log(log_entry)
+        self.metrics_exporter.record(job.name, metrics, success)
+
+    async def _wait_until(self, fire_time):
+        """Sleep until fire_time; return False if shutdown was requested first"""
+        while True:
+            delay = (fire_time - datetime.now()).total_seconds()
+            if delay <= 0:
+                return True
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+                return False
+            except asyncio.TimeoutError:
+                continue  # Re-check in case the wall clock moved while sleeping
+
+    async def _run_job(self, job, executor):
+        """Fire a job at each trigger time, running the organize call in the executor"""
+        loop = asyncio.get_running_loop()
+        root_lock = self._root_locks.setdefault(job.root_key, asyncio.Lock())
+        fire_time = job.trigger.first_fire(datetime.now())
+
+        while await self._wait_until(fire_time):
+            if root_lock.locked():
+                print(f"[{job.name}] Previous run on {job.root_key} still in progress, skipping")
+            else:
+                async with root_lock:
+                    try:
+                        await loop.run_in_executor(executor, self.auto_organize, job)
+                    except Exception as e:
+                        print(f"[{job.name}] Scheduled run crashed: {e}")
+
+            fire_time = job.trigger.next_fire(fire_time, datetime.now())
+            print(f"[{job.name}] Next run at {fire_time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    def _install_signal_handlers(self, loop):
+        """Request a clean shutdown on SIGTERM / SIGINT"""
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows event loops don't support add_signal_handler
+                signal.signal(sig, lambda *_: loop.call_soon_threadsafe(self.stop))
+
+    def stop(self):
+        """Ask the running scheduler to shut down after in-flight runs finish"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def run_async(self):
+        """Run all scheduled jobs until stop() is called or a signal arrives"""
+        loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._install_signal_handlers(loop)
+
+        if self.metrics_port is not None:
+            host, port = self.metrics_exporter.serve(self.metrics_port)
+            print(f"Serving metrics on http://{host}:{port}/metrics")
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.jobs), thread_name_prefix="organize") as executor:
+                tasks = [asyncio.create_task(self._run_job(job, executor)) for job in self.jobs]
+                try:
+                    await asyncio.gather(*tasks)
+                finally:
+                    # If one job loop crashed, stop the others and let their in-flight runs finish
+                    self.stop()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self.metrics_exporter.shutdown()
+            print("Desktop Organizer Scheduler Stopped")
 
     def run(self):
         """Run the scheduler"""
         print("Desktop Organizer Scheduler Started")
-        print("Checking for date changes every hour...")
-
-        # Schedule the check to run every hour
-        schedule.every(1).hours.do(self.auto_organize)
+        for job in self.jobs:
+            print(f"  {job.name}: {job.mode} organize of {job.root_key}, {job.trigger}")
 
-        # Also check immediately on startup
-        self.auto_organize()
+        # Priority is per process, so lower it before the worker threads are started
+        if self.throttle.low_priority:
+            applied = lower_process_priority()
+            print(f"Running at lowered priority: nice={applied['nice']}, idle I/O={applied['io_idle']}")
 
-        # Keep the script running
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+        asyncio.run(self.run_async())
 
 
 if __name__ == "__main__":
-    scheduler = DesktopOrganizerScheduler()
-    scheduler.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Desktop Organizer background scheduler")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile the next organize run with cProfile and tracemalloc")
+    args = parser.parse_args()
+
+    scheduler = DesktopOrganizerScheduler(profile=args.profile)
+    scheduler.run()
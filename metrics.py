@@ -0,0 +1,183 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+# Phases of an organize run, in the order they happen
+PHASES = ('scan', 'classify', 'collision_resolve', 'move', 'throttle_wait', 'log_write')
+
+# The log entry is built before it is written, so its own write time can't be in it
+ENTRY_EXCLUDED_PHASES = ('log_write',)
+
+# Per-run counters
+COUNTERS = ('files', 'bytes', 'retries', 'cross_device_moves')
+
+
+class RunMetrics:
+    """Timers and counters for a single organize run"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    @contextmanager
+    def phase(self, name):
+        """Add the time spent inside the block to the named phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def record_wait(self, seconds, inside='move'):
+        """Move throttle sleep time out of the phase it happened in and into throttle_wait"""
+        if seconds:
+            self.phases[inside] -= seconds
+            self.phases['throttle_wait'] += seconds
+
+    def count(self, name, amount=1):
+        """Increase a counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @property
+    def duration(self):
+        return sum(self.phases.values())
+
+    def as_dict(self):
+        """Structured form stored in the LogManager entry"""
+        phases = {name: seconds for name, seconds in self.phases.items() if name not in ENTRY_EXCLUDED_PHASES}
+        return {
+            'duration_seconds': round(sum(phases.values()), 6),
+            'phases': {name: round(seconds, 6) for name, seconds in phases.items()},
+            'counters': dict(self.counters)
+        }
+
+
+class MetricsExporter:
+    """
+    Collects finished runs and exposes them in the Prometheus text format,
+    either as a node_exporter textfile or over a small local HTTP endpoint.
+    """
+
+    PREFIX = "desktop_organizer"
+
+    def __init__(self, textfile=None):
+        self.textfile = Path(textfile) if textfile else None
+        self._lock = threading.Lock()
+        self._totals = {}
+        self._last_runs = {}
+        self._server = None
+
+    def record(self, job, metrics, success):
+        """Add a finished run to the totals and refresh the textfile"""
+        with self._lock:
+            totals = self._totals.setdefault(job, {
+                'runs': 0,
+                'failures': 0,
+                'phases': dict.fromkeys(PHASES, 0.0),
+                'counters': dict.fromkeys(COUNTERS, 0)
+            })
+            totals['runs'] += 1
+            totals['failures'] += 0 if success else 1
+            for name, seconds in metrics.phases.items():
+                totals['phases'][name] = totals['phases'].get(name, 0.0) + seconds
+            for name, value in metrics.counters.items():
+                totals['counters'][name] = totals['counters'].get(name, 0) + value
+            self._last_runs[job] = (metrics, success)
+
+        if self.textfile:
+            self.write_textfile()
+
+    def render(self):
+        """Render all metrics in the Prometheus exposition format"""
+        p = self.PREFIX
+        lines = []
+
+        def family(name, metric_type, help_text, samples):
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {metric_type}")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f"{p}_{name}{{{label_str}}} {value}")
+
+        with self._lock:
+            totals = dict(self._totals)
+            last_runs = dict(self._last_runs)
+
+        family("runs_total", "counter", "Organize runs since start.",
+               [({'job': job}, t['runs']) for job, t in totals.items()])
+        family("run_failures_total", "counter", "Failed organize runs since start.",
+               [({'job': job}, t['failures']) for job, t in totals.items()])
+        family("phase_seconds_total", "counter", "Time spent per phase since start.",
+               [({'job': job, 'phase': name}, f"{seconds:.6f}")
+                for job, t in totals.items() for name, seconds in t['phases'].items()])
+        for counter in COUNTERS:
+            family(f"{counter}_total", "counter", f"Sum of {counter.replace('_', ' ')} since start.",
+                   [({'job': job}, t['counters'].get(counter, 0)) for job, t in totals.items()])
+
+        family("last_run_timestamp_seconds", "gauge", "Start time of the last run.",
+               [({'job': job}, f"{m.started:.3f}") for job, (m, _) in last_runs.items()])
+        family("last_run_success", "gauge", "1 if the last run succeeded.",
+               [({'job': job}, int(ok)) for job, (_, ok) in last_runs.items()])
+        family("last_run_duration_seconds", "gauge", "Duration of the last run.",
+               [({'job': job}, f"{m.duration:.6f}") for job, (m, _) in last_runs.items()])
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self):
+        """Atomically write the metrics for node_exporter's textfile collector"""
+        import tempfile  # Pulls in random and hashlib, which the quick CLI commands don't need
+
+        self.textfile.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.textfile.parent), suffix=".prom.tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(self.render())
+            os.replace(tmp_path, self.textfile)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve /metrics on a background thread"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        thread.start()
+        return self._server.server_address
+
+    def shutdown(self):
+        """Stop the HTTP endpoint if it is running"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _escape(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,84 @@
+"""
+Opt-in profiling for a single organize run.
+Only imported when profiling is requested, so normal runs pay nothing for it.
+"""
+
+import cProfile
+import pstats
+import io
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+
+class RunProfiler:
+    """
+    Context manager that wraps one organize run in cProfile and tracemalloc.
+    On exit it writes a .prof file and a top-allocations report into log_dir.
+    """
+
+    def __init__(self, log_dir="logs", label="organize", top=25):
+        self.log_dir = Path(log_dir)
+        self.label = "_".join("".join(c if c.isalnum() else " " for c in label).split()).lower()
+        self.top = top
+        self.prof_path = None
+        self.report_path = None
+        self._profiler = None
+        self._started_tracing = False
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        self.log_dir.mkdir(exist_ok=True)
+        # Microseconds keep two profiled runs in the same second from overwriting each other
+        stamp = datetime.now().strftime('%Y-%m-%d_%H%M%S_%f')
+        base = self.log_dir / f"profile_{stamp}_{self.label}"
+        self.prof_path = base.with_suffix(".prof")
+        self.report_path = Path(f"{base}_allocations.txt")
+
+        self._profiler.dump_stats(str(self.prof_path))
+        self._write_report(snapshot, current, peak)
+        return False
+
+    def _write_report(self, snapshot, current, peak):
+        """Write the top allocation sites and the hottest functions as text"""
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        stats = snapshot.statistics('lineno')
+
+        functions = io.StringIO()
+        pstats.Stats(self._profiler, stream=functions).sort_stats('cumulative').print_stats(self.top)
+
+        with open(self.report_path, 'w') as f:
+            f.write(f"Profile Report - {self.label}\n")
+            f.write("=" * 60 + "\n\n")
+            f.write(f"CPU profile: {self.prof_path.name}\n")
+            f.write(f"Traced memory at end: {current / 1024:.1f} KiB\n")
+            f.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n\n")
+
+            f.write(f"Top {self.top} allocation sites\n")
+            f.write("-" * 60 + "\n")
+            for stat in stats[:self.top]:
+                frame = stat.traceback[0]
+                f.write(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}\n")
+
+            f.write("\nTop functions by cumulative time\n")
+            f.write("-" * 60 + "\n")
+            f.write(functions.getvalue())
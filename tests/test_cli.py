@@ -0,0 +1,158 @@
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+from unittest import mock
+
+import cli
+
+
+CLI_PATH = Path(__file__).resolve().parent.parent / "cli.py"
+
+# Modules the quick commands must never pay for at start-up
+HEAVY_MODULES = {'tkinter', 'asyncio', 'http.server', 'cProfile', 'tracemalloc'}
+
+# tempfile and what it pulls in; only loaded when something is written through it
+HASHING_MODULES = {'tempfile', 'random', 'hashlib', '_sha512'}
+
+# Wall-clock budget for the quick commands, on an interpreter that starts in about 20 ms
+BUDGET_SECONDS = 0.100
+BARE_INTERPRETER_SECONDS = 0.020
+
+
+def imported_modules(*args, cwd):
+    """Run the CLI under -X importtime and return the names of every imported module"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(CLI_PATH), *args],
+        cwd=cwd, capture_output=True, text=True, check=True
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def best_wall_time(*args, cwd, runs=5):
+    """Fastest of several runs, to keep scheduler noise out of the measurement"""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=cwd, capture_output=True, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.root = self.tmp_dir / "root"
+        self.root.mkdir()
+        for name in ("a.txt", "b.png"):
+            (self.root / name).touch()
+        (self.tmp_dir / "config.json").write_text("{}")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_cli(self, *args, cwd=None):
+        old_cwd = os.getcwd()
+        os.chdir(cwd or self.tmp_dir)
+        try:
+            return cli.main(["--config", str(self.tmp_dir / "config.json"),
+                             "--log-dir", str(self.tmp_dir / "logs"), *args])
+        finally:
+            os.chdir(old_cwd)
+
+    def test_quick_commands_skip_heavy_imports(self):
+        for command in ("summary", "export", "undo"):
+            with self.subTest(command=command):
+                modules = imported_modules(command, cwd=self.tmp_dir)
+                self.assertIn("log_manager", modules)
+                self.assertFalse((HEAVY_MODULES | HASHING_MODULES) & modules)
+
+    def test_organize_skips_heavy_imports(self):
+        modules = imported_modules("organize", "--path", "root", cwd=self.tmp_dir)
+        self.assertIn("desktop_organizer", modules)
+        self.assertFalse((HEAVY_MODULES | HASHING_MODULES) & modules)
+
+    def test_quick_commands_fit_the_time_budget(self):
+        # Scale the budget by how slow this machine starts a bare interpreter
+        bare = best_wall_time("-c", "pass", cwd=self.tmp_dir)
+        budget = BUDGET_SECONDS + max(0.0, bare - BARE_INTERPRETER_SECONDS)
+        for command in ("summary", "export", "undo"):
+            with self.subTest(command=command):
+                self.assertLess(best_wall_time(str(CLI_PATH), command, cwd=self.tmp_dir), budget)
+
+    def test_schedule_uses_log_dir(self):
+        import main
+
+        with mock.patch.object(main.DesktopOrganizerScheduler, 'run', autospec=True) as run:
+            self.assertEqual(self.run_cli("schedule"), 0)
+        scheduler = run.call_args.args[0]
+        self.assertEqual(scheduler.log_manager.log_dir, self.tmp_dir / "logs")
+
+    def test_relative_path_is_logged_absolute_and_undo_works_elsewhere(self):
+        self.assertEqual(self.run_cli("organize", "--path", "root"), 0)
+        self.assertEqual(sorted(p.name for p in self.root.iterdir()), ["Documents", "Images"])
+
+        elsewhere = self.tmp_dir / "elsewhere"
+        elsewhere.mkdir()
+        self.assertEqual(self.run_cli("undo", cwd=elsewhere), 0)
+        self.assertTrue((self.root / "a.txt").exists())
+        self.assertTrue((self.root / "b.png").exists())
+
+    def test_partial_undo_stays_undoable(self):
+        self.run_cli("organize", "--path", "root")
+        (self.root / "a.txt").touch()  # Something now sits where a.txt came from
+
+        self.assertEqual(self.run_cli("undo"), 1)
+        self.assertTrue((self.root / "b.png").exists())
+
+        (self.root / "a.txt").unlink()
+        self.assertEqual(self.run_cli("undo"), 0)
+        self.assertTrue((self.root / "a.txt").exists())
+
+        logs = json.loads(next((self.tmp_dir / "logs").glob("*.json")).read_text())
+        self.assertTrue(logs[0]['undone'])
+
+    def test_deleted_file_does_not_block_undo(self):
+        self.run_cli("organize", "--path", "root")
+        (self.root / "c.txt").touch()
+        self.run_cli("organize", "--path", "root")
+        (self.root / "Images" / "b.png").unlink()  # Moved by the first run, then deleted
+
+        self.assertEqual(self.run_cli("undo"), 0)  # Second run: only c.txt
+        self.assertTrue((self.root / "c.txt").exists())
+        self.assertEqual(self.run_cli("undo"), 0)  # First run: a.txt back, b.png gone for good
+        self.assertTrue((self.root / "a.txt").exists())
+        self.assertEqual(self.run_cli("undo"), 0)
+
+        logs = json.loads(next((self.tmp_dir / "logs").glob("*.json")).read_text())
+        undo_entries = [log for log in logs if log['organization_type'].startswith("Undo")]
+        self.assertEqual([log['files_moved'] for log in undo_entries], [1, 1])
+        self.assertTrue(all(log.get('undone') for log in logs if log not in undo_entries))
+
+    def test_blocked_undo_writes_no_empty_entry(self):
+        self.run_cli("organize", "--path", "root")
+        (self.root / "a.txt").touch()
+        (self.root / "b.png").touch()
+
+        self.assertEqual(self.run_cli("undo"), 1)
+        logs = json.loads(next((self.tmp_dir / "logs").glob("*.json")).read_text())
+        self.assertEqual(len(logs), 1)
+        self.assertFalse(logs[0].get('undone'))
+
+    def test_negative_limit_is_rejected(self):
+        with self.assertRaises(SystemExit):
+            self.run_cli("organize", "--path", "root", "--bytes-per-sec", "-5")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import multiprocessing
+from pathlib import Path
+
+import config_store
+from config_store import ConfigStore
+
+
+def _increment_many(config_path, times):
+    store = ConfigStore(config_path)
+    for _ in range(times):
+        store.modify(lambda config: config.update(counter=config.get('counter', 0) + 1))
+
+
+def _set_many(config_path, worker, times):
+    store = ConfigStore(config_path)
+    for i in range(times):
+        store.set(f"worker_{worker}", i)
+
+
+class ConfigStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.config_path = Path(self.tmp_dir) / "config.json"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_missing_file_loads_empty(self):
+        self.assertEqual(ConfigStore(self.config_path).load(), {})
+
+    def test_update_keeps_other_keys(self):
+        self.config_path.write_text(json.dumps({'keep': 1}))
+        ConfigStore(self.config_path).set('last_run_date', '2026-01-01')
+        self.assertEqual(json.loads(self.config_path.read_text()), {'keep': 1, 'last_run_date': '2026-01-01'})
+
+    def test_rewrite_by_other_writer_invalidates_cache(self):
+        reader = ConfigStore(self.config_path)
+        writer = ConfigStore(self.config_path)
+        writer.set('last_run_date', '2026-01-01')
+        self.assertEqual(reader.get('last_run_date'), '2026-01-01')
+
+        # Same length and a pinned mtime: only the new inode gives the change away
+        stat = self.config_path.stat()
+        writer.set('last_run_date', '2026-01-02')
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(reader.get('last_run_date'), '2026-01-02')
+
+    def test_nested_values_are_copied_on_load(self):
+        store = ConfigStore(self.config_path)
+        store.set('last_run_dates', {'/a': '2026-01-01'})
+        store.load()['last_run_dates']['/a'] = '2026-01-02'
+        self.assertEqual(store.get('last_run_dates'), {'/a': '2026-01-01'})
+
+        # A real change made through modify must still be written
+        store.modify(lambda config: config['last_run_dates'].update({'/a': '2026-01-02'}))
+        self.assertEqual(json.loads(self.config_path.read_text())['last_run_dates'], {'/a': '2026-01-02'})
+
+    def test_modify_only_writes_on_change(self):
+        store = ConfigStore(self.config_path)
+        store.set('a', 1)
+        before = self.config_path.stat().st_ino
+        self.assertEqual(store.modify(lambda config: config.get('a')), 1)
+        self.assertEqual(self.config_path.stat().st_ino, before)
+
+    @unittest.skipIf(config_store.fcntl is None, "cross-process locking needs fcntl")
+    def test_concurrent_writers_from_several_processes(self):
+        processes = [
+            multiprocessing.Process(target=_set_many, args=(str(self.config_path), worker, 20))
+            for worker in range(4)
+        ]
+        processes += [
+            multiprocessing.Process(target=_increment_many, args=(str(self.config_path), 25))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+            self.assertEqual(process.exitcode, 0)
+
+        config = ConfigStore(self.config_path).load()
+        self.assertEqual(config['counter'], 100)
+        self.assertEqual({config[f"worker_{worker}"] for worker in range(4)}, {19})
+        self.assertEqual([p.name for p in Path(self.tmp_dir).glob("*.tmp")], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
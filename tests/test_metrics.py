@@ -0,0 +1,139 @@
+import json
+import shutil
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest import mock
+
+import metrics
+from log_manager import LogManager
+from metrics import MetricsExporter, RunMetrics
+
+
+class FakeTime:
+    """Stands in for metrics.time with a clock that only moves when told to"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+    def time(self):
+        return 1700000000.0
+
+
+class RunMetricsTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(metrics, 'time', FakeTime())
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_phase_accumulates_time(self):
+        run = RunMetrics()
+        for _ in range(2):
+            with run.phase('move'):
+                self.clock.now += 1.5
+        self.assertEqual(run.phases['move'], 3.0)
+
+    def test_phase_records_time_when_the_block_raises(self):
+        run = RunMetrics()
+        with self.assertRaises(OSError):
+            with run.phase('scan'):
+                self.clock.now += 2
+                raise OSError("gone")
+        self.assertEqual(run.phases['scan'], 2.0)
+
+    def test_throttle_wait_is_moved_out_of_the_phase(self):
+        run = RunMetrics()
+        with run.phase('move'):
+            self.clock.now += 3
+            run.record_wait(2.5)
+        self.assertAlmostEqual(run.phases['move'], 0.5)
+        self.assertAlmostEqual(run.phases['throttle_wait'], 2.5)
+        self.assertAlmostEqual(run.duration, 3.0)
+
+    def test_as_dict_leaves_out_log_write(self):
+        run = RunMetrics()
+        with run.phase('scan'):
+            self.clock.now += 1
+        with run.phase('log_write'):
+            self.clock.now += 4
+        run.count('files', 3)
+
+        data = run.as_dict()
+        self.assertNotIn('log_write', data['phases'])
+        self.assertEqual(data['duration_seconds'], 1.0)
+        self.assertEqual(data['counters']['files'], 3)
+
+
+class MetricsExporterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def make_run(self, files):
+        run = RunMetrics()
+        run.count('files', files)
+        run.phases['move'] = 0.25
+        return run
+
+    def test_render_totals_and_last_run(self):
+        exporter = MetricsExporter()
+        exporter.record('desk"top', self.make_run(2), True)
+        exporter.record('desk"top', self.make_run(3), False)
+        text = exporter.render()
+
+        self.assertIn('desktop_organizer_runs_total{job="desk\\"top"} 2', text)
+        self.assertIn('desktop_organizer_run_failures_total{job="desk\\"top"} 1', text)
+        self.assertIn('desktop_organizer_files_total{job="desk\\"top"} 5', text)
+        self.assertIn('desktop_organizer_phase_seconds_total{job="desk\\"top",phase="move"} 0.500000', text)
+        self.assertIn('desktop_organizer_last_run_success{job="desk\\"top"} 0', text)
+        self.assertIn("# TYPE desktop_organizer_runs_total counter", text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_record_writes_the_textfile(self):
+        textfile = self.tmp_dir / "prom" / "organizer.prom"
+        exporter = MetricsExporter(textfile)
+        exporter.record('desktop', self.make_run(1), True)
+
+        self.assertEqual(textfile.read_text(), exporter.render())
+        self.assertEqual([p.name for p in textfile.parent.iterdir()], ["organizer.prom"])
+
+    def test_serve_metrics_over_http(self):
+        exporter = MetricsExporter()
+        exporter.record('desktop', self.make_run(1), True)
+        host, port = exporter.serve(0)
+        self.addCleanup(exporter.shutdown)
+
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            self.assertEqual(response.read().decode('utf-8'), exporter.render())
+        with self.assertRaises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://{host}:{port}/other", timeout=5)
+
+        exporter.shutdown()
+        with self.assertRaises(OSError):
+            urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5)
+
+
+class LogEntryMetricsTest(unittest.TestCase):
+    def test_metrics_section_is_saved_with_the_entry(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        log_manager = LogManager(tmp_dir)
+        run = RunMetrics()
+        run.count('files', 1)
+
+        log_manager.save_log(log_manager.create_log_entry("Test", [{'file': 'a.txt'}], metrics=run))
+        log_manager.save_log(log_manager.create_log_entry("Plain", []))
+
+        with open(log_manager.log_file) as f:
+            with_metrics, without_metrics = json.load(f)
+        self.assertEqual(with_metrics['metrics'], run.as_dict())
+        self.assertNotIn('metrics', without_metrics)
+
+
+if __name__ == "__main__":
+    unittest.main()
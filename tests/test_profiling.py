@@ -0,0 +1,108 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from desktop_organizer import DesktopOrganizer
+from profiling import RunProfiler
+
+
+class RunProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.root = self.tmp_dir / "root"
+        self.root.mkdir()
+        for name in ("a.txt", "b.png"):
+            (self.root / name).touch()
+        self.log_dir = self.tmp_dir / "logs"
+
+    def test_writes_profile_and_allocation_report(self):
+        with RunProfiler(self.log_dir, label="Quick Organize (Extension)") as profiler:
+            success, result = DesktopOrganizer(self.root).organize_by_extension()
+
+        self.assertTrue(success)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(profiler.prof_path.parent, self.log_dir)
+        self.assertTrue(profiler.prof_path.name.endswith("_quick_organize_extension.prof"))
+        self.assertGreater(profiler.prof_path.stat().st_size, 0)
+        self.assertEqual(profiler.report_path.parent, self.log_dir)
+        self.assertTrue(profiler.report_path.name.endswith("_allocations.txt"))
+
+        report = profiler.report_path.read_text()
+        self.assertIn("allocation sites", report)
+        self.assertIn("organize_by_extension", report)
+
+    def test_runs_in_the_same_second_get_separate_files(self):
+        paths = set()
+        for _ in range(2):
+            with RunProfiler(self.log_dir, label="run") as profiler:
+                pass
+            paths.add(profiler.prof_path)
+        self.assertEqual(len(paths), 2)
+        self.assertEqual(len(list(self.log_dir.glob("*.prof"))), 2)
+
+
+class SchedulerProfileFlagTest(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        os.mkdir("root")
+        with open("config.json", 'w') as f:
+            json.dump({'schedules': [{'name': 'root', 'path': 'root'}]}, f)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_flag_clears_after_one_run(self):
+        from main import DesktopOrganizerScheduler
+
+        scheduler = DesktopOrganizerScheduler("config.json", profile=True)
+        with mock.patch('builtins.print'):
+            scheduler.auto_organize()
+            self.assertFalse(scheduler.profile_next_run)
+            scheduler.auto_organize()
+
+        self.assertEqual(len(list(Path("logs").glob("*.prof"))), 1)
+
+
+class GuiProfileFlagTest(unittest.TestCase):
+    def test_flag_clears_after_one_run(self):
+        try:
+            import gui
+        except ImportError:
+            self.skipTest("tkinter is not available")
+
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+
+        # Build the window object without Tk: only the run logic is under test
+        app = gui.DesktopOrganizerGUI.__new__(gui.DesktopOrganizerGUI)
+        app.root = mock.Mock()
+        app.status_label = mock.Mock()
+        app.last_run_label = mock.Mock()
+        app.date_checker = mock.Mock()
+        app.log_manager = mock.Mock(log_dir=Path(tmp_dir))
+        app.load_today_log = mock.Mock()
+        app.profile_next_run = False
+
+        app.toggle_profiling()
+        self.assertTrue(app.profile_next_run)
+
+        run = mock.Mock(return_value=(True, []))
+        with mock.patch.object(gui, 'messagebox'):
+            app._run_organization(run, "Organize by Name (A-Z)")
+            self.assertFalse(app.profile_next_run)
+            app._run_organization(run, "Organize by Name (A-Z)")
+
+        self.assertEqual(run.call_count, 2)
+        self.assertEqual(len(list(Path(tmp_dir).glob("*.prof"))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+import os
+import json
+import shutil
+import signal
+import asyncio
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import main
+from main import DesktopOrganizerScheduler, ScheduledJob
+
+
+class FakeClock:
+    """Stands in for main.datetime, returning the given times from now()"""
+
+    def __init__(self, times):
+        self.times = list(times)
+        self.calls = 0
+
+    def now(self):
+        self.calls += 1
+        return self.times.pop(0) if len(self.times) > 1 else self.times[0]
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        for root in ("a", "b"):
+            os.mkdir(root)
+            open(os.path.join(root, f"{root}.txt"), 'w').close()
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def make_scheduler(self, config):
+        with open("config.json", 'w') as f:
+            json.dump(config, f)
+        return DesktopOrganizerScheduler("config.json")
+
+    def test_invalid_trigger_fails_at_startup(self):
+        with self.assertRaisesRegex(ValueError, "job 'bad'.*never fires"):
+            ScheduledJob({'name': 'bad', 'path': 'a', 'cron': '0 0 31 2 *'})
+
+    def test_date_change_is_tracked_per_root(self):
+        scheduler = self.make_scheduler({
+            'last_run_date': '2000-01-01',
+            'schedules': [
+                {'name': 'a', 'path': 'a', 'on_date_change': True},
+                {'name': 'b', 'path': 'b', 'on_date_change': True},
+            ]
+        })
+        job_a, job_b = scheduler.jobs
+
+        self.assertTrue(scheduler._claim_date_change(job_a)[0])
+        self.assertTrue(scheduler._claim_date_change(job_b)[0])
+        self.assertFalse(scheduler._claim_date_change(job_a)[0])
+
+        config = scheduler.config_store.load()
+        self.assertEqual(set(config['last_run_dates']), {job_a.root_key, job_b.root_key})
+        self.assertEqual(config['last_run_date'], '2000-01-01')
+
+    def test_jobs_share_the_global_throttle(self):
+        scheduler = self.make_scheduler({
+            'throttle': {'ops_per_sec': 10, 'low_priority': True},
+            'schedules': [
+                {'name': 'a', 'path': 'a'},
+                {'name': 'b', 'path': 'b', 'throttle': {'bytes_per_sec': 1000}},
+            ]
+        })
+        job_a, job_b = scheduler.jobs
+        self.assertIs(job_a.throttle, scheduler.throttle)
+        self.assertIs(job_b.throttle.parent, scheduler.throttle)
+        self.assertTrue(scheduler.throttle.low_priority)
+
+    def test_default_desktop_job_keeps_legacy_key(self):
+        job = ScheduledJob(main.DEFAULT_SCHEDULE)
+        self.assertTrue(job.uses_legacy_date)
+        self.assertFalse(ScheduledJob({'path': 'a'}).uses_legacy_date)
+
+    def test_relative_path_is_resolved(self):
+        job = ScheduledJob({'path': 'a'})
+        self.assertTrue(job.organizer.desktop_path.is_absolute())
+        self.assertEqual(str(job.organizer.desktop_path), job.root_key)
+
+    def test_overlapping_run_on_the_same_root_is_skipped(self):
+        scheduler = self.make_scheduler({
+            'schedules': [{'name': 'a', 'path': 'a', 'interval': 60}]
+        })
+        job = scheduler.jobs[0]
+        runs = []
+        scheduler.auto_organize = runs.append
+
+        async def run():
+            scheduler._stop_event = asyncio.Event()
+            lock = scheduler._root_locks.setdefault(job.root_key, asyncio.Lock())
+            waits = []
+
+            async def fake_wait(fire_time):
+                # Fire once while another run holds the root, then stop
+                waits.append(fire_time)
+                return len(waits) == 1
+
+            scheduler._wait_until = fake_wait
+            async with lock:
+                await scheduler._run_job(job, None)
+            return waits
+
+        with mock.patch('builtins.print') as printed:
+            waits = asyncio.run(run())
+
+        self.assertEqual(runs, [])
+        self.assertEqual(len(waits), 2)
+        self.assertTrue(any("still in progress" in str(c.args[0]) for c in printed.call_args_list))
+
+    def test_run_job_offloads_to_the_executor(self):
+        scheduler = self.make_scheduler({
+            'schedules': [{'name': 'a', 'path': 'a', 'interval': 60}]
+        })
+        job = scheduler.jobs[0]
+        threads = []
+        scheduler.auto_organize = lambda job: threads.append(threading.current_thread())
+
+        async def run():
+            scheduler._stop_event = asyncio.Event()
+            calls = []
+
+            async def fake_wait(fire_time):
+                calls.append(fire_time)
+                return len(calls) == 1
+
+            scheduler._wait_until = fake_wait
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                await scheduler._run_job(job, executor)
+
+        with mock.patch('builtins.print'):
+            asyncio.run(run())
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+    @unittest.skipUnless(hasattr(signal, 'SIGTERM') and os.name == 'posix', "needs POSIX signals")
+    def test_sigterm_stops_the_scheduler(self):
+        scheduler = self.make_scheduler({
+            'schedules': [{'name': 'a', 'path': 'a', 'interval': 3600, 'run_on_start': False}]
+        })
+
+        async def run():
+            asyncio.get_running_loop().call_later(0.05, os.kill, os.getpid(), signal.SIGTERM)
+            await asyncio.wait_for(scheduler.run_async(), timeout=5)
+
+        with mock.patch('builtins.print'):
+            asyncio.run(run())
+        self.assertTrue(scheduler._stop_event.is_set())
+
+    def test_crashed_job_still_shuts_down_the_metrics_server(self):
+        scheduler = self.make_scheduler({
+            'metrics': {'http_port': 0},
+            'schedules': [{'name': 'a', 'path': 'a', 'interval': 60}]
+        })
+
+        async def crash(job, executor):
+            raise RuntimeError("job loop crashed")
+
+        scheduler._run_job = crash
+        with mock.patch('builtins.print'):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(scheduler.run_async())
+        self.assertIsNone(scheduler.metrics_exporter._server)
+
+    def test_wait_rechecks_the_clock_after_waking(self):
+        scheduler = self.make_scheduler({})
+        fire_time = datetime(2026, 10, 19, 12, 0)
+        # The clock jumps back after the first sleep, so a second sleep is needed
+        clock = FakeClock([
+            fire_time - timedelta(seconds=0.01),
+            fire_time - timedelta(seconds=0.01),
+            fire_time,
+        ])
+
+        async def wait():
+            scheduler._stop_event = asyncio.Event()
+            return await scheduler._wait_until(fire_time)
+
+        with mock.patch.object(main, 'datetime', clock):
+            self.assertTrue(asyncio.run(wait()))
+        self.assertEqual(clock.calls, 3)
+
+    def test_wait_returns_false_on_stop(self):
+        scheduler = self.make_scheduler({})
+
+        async def wait():
+            scheduler._stop_event = asyncio.Event()
+            scheduler._stop_event.set()
+            return await scheduler._wait_until(datetime.now() + timedelta(hours=1))
+
+        self.assertFalse(asyncio.run(wait()))
+
+
+if __name__ == "__main__":
+    unittest.main()
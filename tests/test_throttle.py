@@ -0,0 +1,146 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import throttle
+from throttle import Throttle, TokenBucket
+
+
+class FakeTime:
+    """Stands in for throttle.time: sleeping just advances the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(throttle, 'time', FakeTime())
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_up_to_capacity_does_not_wait(self):
+        bucket = TokenBucket(10)
+        for _ in range(10):
+            self.assertEqual(bucket.acquire(1), 0)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_waits_once_empty(self):
+        bucket = TokenBucket(10)
+        bucket.acquire(10)
+        self.assertAlmostEqual(bucket.acquire(5), 0.5)
+
+    def test_refills_over_time(self):
+        bucket = TokenBucket(10)
+        bucket.acquire(10)
+        self.clock.now += 1
+        self.assertEqual(bucket.acquire(10), 0)
+
+    def test_refill_is_capped_at_capacity(self):
+        bucket = TokenBucket(10)
+        self.clock.now += 60
+        bucket.acquire(10)
+        self.assertAlmostEqual(bucket.acquire(1), 0.1)
+
+    def test_request_larger_than_capacity_goes_into_debt(self):
+        bucket = TokenBucket(10)
+        self.assertAlmostEqual(bucket.acquire(30), 2.0)
+        self.assertAlmostEqual(bucket.acquire(10), 1.0)
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class ThrottleTest(unittest.TestCase):
+    def test_from_config_later_values_win_and_none_is_ignored(self):
+        t = Throttle.from_config({'ops_per_sec': 5, 'bytes_per_sec': 100}, {'ops_per_sec': 2, 'bytes_per_sec': None})
+        self.assertEqual((t.ops_per_sec, t.bytes_per_sec, t.low_priority), (2, 100, False))
+
+    def test_from_config_rejects_bad_limits(self):
+        for value in (-5, "fast", True):
+            with self.subTest(value=value):
+                with self.assertRaisesRegex(ValueError, "bytes_per_sec"):
+                    Throttle.from_config({'bytes_per_sec': value})
+
+    def test_children_share_the_parent_budget(self):
+        with mock.patch.object(throttle, 'time', FakeTime()):
+            shared = Throttle(ops_per_sec=10)
+            first = Throttle.from_config({'bytes_per_sec': 5}, parent=shared)
+            second = Throttle.from_config({}, parent=shared)
+            for _ in range(5):
+                self.assertEqual(first.operation(), 0)
+                self.assertEqual(second.operation(), 0)
+            # Ten operations between them used up the shared bucket
+            self.assertAlmostEqual(second.operation(), 0.1)
+
+    def test_effective_bytes_limit_is_the_tightest(self):
+        shared = Throttle(bytes_per_sec=100)
+        self.assertEqual(Throttle(parent=shared).effective_bytes_per_sec, 100)
+        self.assertEqual(Throttle(bytes_per_sec=40, parent=shared).effective_bytes_per_sec, 40)
+        self.assertIsNone(Throttle().effective_bytes_per_sec)
+
+    def test_zero_means_unlimited(self):
+        t = Throttle.from_config({'bytes_per_sec': 0, 'ops_per_sec': 0})
+        self.assertEqual(t.operation(), 0)
+        self.assertEqual(t.transfer(10 ** 9), 0)
+
+    def test_copy_file_pays_per_chunk(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        source = os.path.join(tmp_dir, "source.bin")
+        destination = os.path.join(tmp_dir, "destination.bin")
+        data = os.urandom(35)
+        with open(source, 'wb') as f:
+            f.write(data)
+
+        t = Throttle(bytes_per_sec=10)
+        with mock.patch.object(t, 'transfer', return_value=0) as transfer:
+            t.copy_file(source, destination)
+
+        self.assertEqual([c.args[0] for c in transfer.call_args_list], [10, 10, 10, 5])
+        with open(destination, 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+    def test_copy_file_removes_partial_destination_on_error(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        source = os.path.join(tmp_dir, "source.bin")
+        destination = os.path.join(tmp_dir, "destination.bin")
+        with open(source, 'wb') as f:
+            f.write(b"x" * 30)
+
+        t = Throttle(bytes_per_sec=10)
+        with mock.patch.object(t, 'transfer', side_effect=[0, OSError("disk full")]):
+            with self.assertRaises(OSError):
+                t.copy_file(source, destination)
+        self.assertFalse(os.path.exists(destination))
+
+    def test_copy_file_never_removes_an_existing_destination(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        source = os.path.join(tmp_dir, "source.bin")
+        destination = os.path.join(tmp_dir, "destination.bin")
+        with open(source, 'wb') as f:
+            f.write(b"new")
+        with open(destination, 'wb') as f:
+            f.write(b"PRECIOUS")
+
+        with self.assertRaises(FileExistsError):
+            Throttle(bytes_per_sec=100).copy_file(source, destination)
+        with open(destination, 'rb') as f:
+            self.assertEqual(f.read(), b"PRECIOUS")
+
+
+if __name__ == "__main__":
+    unittest.main()
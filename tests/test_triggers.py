@@ -0,0 +1,94 @@
+import unittest
+from datetime import datetime
+
+from triggers import CronTrigger, IntervalTrigger, trigger_from_config
+
+
+# A Monday
+NOW = datetime(2026, 10, 19, 10, 30, 15)
+
+
+class CronTriggerTest(unittest.TestCase):
+    def next_fire(self, expression, now=NOW):
+        return CronTrigger(expression).next_fire(now, now)
+
+    def test_step_from_a_start_value(self):
+        self.assertEqual(CronTrigger("5/15 * * * *").minutes, {5, 20, 35, 50})
+        self.assertEqual(self.next_fire("5/15 * * * *"), datetime(2026, 10, 19, 10, 35))
+
+    def test_ranges_lists_and_steps(self):
+        trigger = CronTrigger("0,30 9-17/4 * * *")
+        self.assertEqual(trigger.minutes, {0, 30})
+        self.assertEqual(trigger.hours, {9, 13, 17})
+
+    def test_weekday_seven_is_sunday(self):
+        self.assertEqual(CronTrigger("0 0 * * 7").weekdays, {0})
+        self.assertEqual(self.next_fire("0 0 * * 7"), datetime(2026, 10, 25, 0, 0))
+
+    def test_day_and_weekday_match_either_when_both_restricted(self):
+        # The 13th or any Friday, whichever comes first
+        self.assertEqual(self.next_fire("0 0 13 * 5"), datetime(2026, 10, 23, 0, 0))
+
+    def test_day_alone_must_match(self):
+        self.assertEqual(self.next_fire("0 0 13 * *"), datetime(2026, 11, 13, 0, 0))
+
+    def test_leap_day(self):
+        self.assertEqual(self.next_fire("30 2 29 2 *"), datetime(2028, 2, 29, 2, 30))
+
+    def test_rolls_over_the_year(self):
+        self.assertEqual(self.next_fire("0 0 1 1 *"), datetime(2027, 1, 1, 0, 0))
+
+    def test_next_fire_is_strictly_later(self):
+        fire = datetime(2026, 10, 19, 11, 0)
+        self.assertEqual(CronTrigger("0 * * * *").next_fire(fire, fire), datetime(2026, 10, 19, 12, 0))
+
+    def test_impossible_date_never_fires(self):
+        with self.assertRaisesRegex(ValueError, "never fires"):
+            self.next_fire("0 0 31 2 *")
+
+    def test_invalid_expressions(self):
+        for expression in ("0 0 *", "60 * * * *", "* 24 * * *", "0 0 0 * *", "5-1 * * * *", "*/0 * * * *"):
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    CronTrigger(expression)
+
+
+class IntervalTriggerTest(unittest.TestCase):
+    def test_first_fire(self):
+        self.assertEqual(IntervalTrigger(60).first_fire(NOW), NOW)
+        self.assertEqual(IntervalTrigger(60, run_on_start=False).first_fire(NOW), datetime(2026, 10, 19, 10, 31, 15))
+
+    def test_next_fire_on_time(self):
+        previous = datetime(2026, 10, 19, 10, 0)
+        self.assertEqual(IntervalTrigger(60).next_fire(previous, previous), datetime(2026, 10, 19, 10, 1))
+
+    def test_catches_up_after_a_long_run(self):
+        previous = datetime(2026, 10, 19, 10, 0)
+        now = datetime(2026, 10, 19, 10, 5, 30)
+        self.assertEqual(IntervalTrigger(60).next_fire(previous, now), datetime(2026, 10, 19, 10, 6))
+
+    def test_catch_up_on_an_exact_boundary(self):
+        previous = datetime(2026, 10, 19, 10, 0)
+        now = datetime(2026, 10, 19, 10, 5)
+        self.assertEqual(IntervalTrigger(60).next_fire(previous, now), datetime(2026, 10, 19, 10, 6))
+
+    def test_rejects_non_positive_interval(self):
+        with self.assertRaises(ValueError):
+            IntervalTrigger(0)
+
+
+class TriggerFromConfigTest(unittest.TestCase):
+    def test_defaults(self):
+        trigger = trigger_from_config({})
+        self.assertIsInstance(trigger, IntervalTrigger)
+        self.assertEqual(trigger.interval.total_seconds(), 3600)
+        self.assertTrue(trigger.run_on_start)
+
+    def test_cron_does_not_run_on_start_by_default(self):
+        trigger = trigger_from_config({'cron': '0 * * * *'})
+        self.assertIsInstance(trigger, CronTrigger)
+        self.assertFalse(trigger.run_on_start)
+
+
+if __name__ == "__main__":
+    unittest.main()
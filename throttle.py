@@ -0,0 +1,175 @@
+import os
+import sys
+import shutil
+import time
+import threading
+import platform
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        """Take `amount` tokens, sleeping until the bucket can pay for them"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+
+            # Requests larger than the bucket go into debt instead of blocking forever
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class Throttle:
+    """
+    Rate limits for an organize run.
+    ops_per_sec caps mkdir/move calls; bytes_per_sec caps data actually copied,
+    i.e. cross-device moves (a same-device move is a rename and copies nothing).
+    A value of 0 or None means no limit.
+    A Throttle can be layered on a shared parent: every operation and byte
+    is then paid to both, so the parent caps the total across all its children.
+    """
+
+    # Cross-device copies are paid for in chunks of at most this size
+    COPY_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, bytes_per_sec=None, ops_per_sec=None, low_priority=False, parent=None):
+        self.parent = parent
+        self.bytes_per_sec = bytes_per_sec
+        self.ops_per_sec = ops_per_sec
+        self.low_priority = low_priority
+        self._bytes = TokenBucket(bytes_per_sec) if bytes_per_sec else None
+        self._ops = TokenBucket(ops_per_sec) if ops_per_sec else None
+
+    @classmethod
+    def from_config(cls, *configs, parent=None):
+        """Build a Throttle from "throttle" config dicts, later ones overriding earlier ones"""
+        merged = {}
+        for config in configs:
+            merged.update({k: v for k, v in (config or {}).items() if v is not None})
+
+        for key in ('bytes_per_sec', 'ops_per_sec'):
+            value = merged.get(key)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0):
+                raise ValueError(f"throttle {key} must be a non-negative number, got {value!r}")
+
+        return cls(
+            bytes_per_sec=merged.get('bytes_per_sec'),
+            ops_per_sec=merged.get('ops_per_sec'),
+            low_priority=bool(merged.get('low_priority', False)),
+            parent=parent
+        )
+
+    @property
+    def effective_bytes_per_sec(self):
+        """The tightest bytes/sec limit of this throttle and its parents, or None"""
+        rates = [self.bytes_per_sec] if self.bytes_per_sec else []
+        if self.parent is not None and self.parent.effective_bytes_per_sec:
+            rates.append(self.parent.effective_bytes_per_sec)
+        return min(rates) if rates else None
+
+    def operation(self):
+        """Account for one filesystem operation; returns the seconds spent waiting"""
+        waited = self.parent.operation() if self.parent is not None else 0
+        if self._ops is not None:
+            waited += self._ops.acquire(1)
+        return waited
+
+    def transfer(self, num_bytes):
+        """Account for bytes copied between devices; returns the seconds spent waiting"""
+        waited = self.parent.transfer(num_bytes) if self.parent is not None else 0
+        if self._bytes is not None and num_bytes > 0:
+            waited += self._bytes.acquire(num_bytes)
+        return waited
+
+    def copy_file(self, source, destination):
+        """
+        Copy a file chunk by chunk, paying the bytes limit before each write
+        so the disk never sees more than one bucket's worth at full speed.
+        Returns the seconds spent waiting.
+        """
+        chunk_size = max(1, min(self.COPY_CHUNK_SIZE, int(self.effective_bytes_per_sec or self.COPY_CHUNK_SIZE)))
+        waited = 0
+
+        with open(source, 'rb') as src:
+            # 'xb' refuses to touch an existing file; only a file created here is cleaned up
+            dst = open(destination, 'xb')
+            try:
+                with dst:
+                    while True:
+                        chunk = src.read(chunk_size)
+                        if not chunk:
+                            break
+                        waited += self.transfer(len(chunk))
+                        dst.write(chunk)
+                shutil.copystat(str(source), str(destination))
+            except BaseException:
+                try:
+                    os.unlink(destination)
+                except OSError:
+                    pass
+                raise
+
+        return waited
+
+
+# ioprio_set syscall numbers per architecture (see asm/unistd.h)
+_IOPRIO_SYSCALLS = {
+    'x86_64': 251,
+    'i386': 289,
+    'i686': 289,
+    'aarch64': 30,
+    'armv7l': 314,
+}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_IDLE = 3
+_IOPRIO_CLASS_SHIFT = 13
+
+
+def _set_idle_io_priority():
+    """Put the calling process in the idle I/O scheduling class via ioprio_set"""
+    syscall_nr = _IOPRIO_SYSCALLS.get(platform.machine())
+    if syscall_nr is None:
+        return False
+
+    import ctypes
+    libc = ctypes.CDLL(None, use_errno=True)
+    ioprio = _IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT
+    return libc.syscall(syscall_nr, _IOPRIO_WHO_PROCESS, 0, ioprio) == 0
+
+
+def lower_process_priority(nice_increment=10):
+    """
+    Lower the CPU and I/O priority of the current process.
+    Call before starting worker threads so they inherit the lower priority.
+    Returns a dict describing what was applied.
+    """
+    applied = {'nice': None, 'io_idle': False}
+
+    if hasattr(os, 'nice'):
+        try:
+            applied['nice'] = os.nice(nice_increment)
+        except OSError:
+            pass
+
+    if sys.platform.startswith('linux'):
+        try:
+            applied['io_idle'] = _set_idle_io_priority()
+        except OSError:
+            pass
+
+    return applied
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+
+
+class IntervalTrigger:
+    """Fires every `seconds` seconds, optionally right away on startup"""
+
+    def __init__(self, seconds, run_on_start=True):
+        if seconds <= 0:
+            raise ValueError("Interval must be a positive number of seconds")
+        self.interval = timedelta(seconds=seconds)
+        self.run_on_start = run_on_start
+
+    def first_fire(self, now):
+        """Return the first fire time after the scheduler starts"""
+        return now if self.run_on_start else now + self.interval
+
+    def next_fire(self, previous, now):
+        """Return the next fire time, skipping intervals missed while a run was in progress"""
+        next_time = previous + self.interval
+        if next_time <= now:
+            missed = (now - previous) // self.interval
+            next_time = previous + self.interval * missed
+            if next_time <= now:
+                next_time += self.interval
+        return next_time
+
+    def __repr__(self):
+        return f"every {int(self.interval.total_seconds())}s"
+
+
+class CronTrigger:
+    """
+    Fires on a standard five-field cron expression: minute hour day month weekday.
+    Fields accept '*', numbers, ranges (a-b), lists (a,b) and steps (*/n, a-b/n).
+    Weekday 0 and 7 are both Sunday.
+    """
+
+    FIELDS = (
+        ('minute', 0, 59),
+        ('hour', 0, 23),
+        ('day', 1, 31),
+        ('month', 1, 12),
+        ('weekday', 0, 7),
+    )
+
+    def __init__(self, expression, run_on_start=False):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+
+        self.expression = expression
+        self.run_on_start = run_on_start
+        values = {}
+        for (name, low, high), part in zip(self.FIELDS, parts):
+            values[name] = self._parse_field(part, low, high, name)
+
+        self.minutes = values['minute']
+        self.hours = values['hour']
+        self.days = values['day']
+        self.months = values['month']
+        self.weekdays = {0 if d == 7 else d for d in values['weekday']}
+
+        # Cron semantics: if both day and weekday are restricted, either may match
+        self.day_restricted = parts[2] != '*'
+        self.weekday_restricted = parts[4] != '*'
+
+    @staticmethod
+    def _parse_field(part, low, high, name):
+        """Expand one cron field into the set of values it matches"""
+        values = set()
+        for item in part.split(','):
+            step = 1
+            if '/' in item:
+                item, step_str = item.split('/', 1)
+                step = int(step_str)
+                if step <= 0:
+                    raise ValueError(f"Invalid step in cron {name} field: {part!r}")
+
+            if item == '*':
+                start, end = low, high
+            elif '-' in item:
+                start_str, end_str = item.split('-', 1)
+                start, end = int(start_str), int(end_str)
+            else:
+                start = int(item)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron {name} field out of range: {part!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment):
+        """Check the day-of-month / day-of-week fields for a date"""
+        cron_weekday = (moment.weekday() + 1) % 7  # Python: Monday=0, cron: Sunday=0
+        day_ok = moment.day in self.days
+        weekday_ok = cron_weekday in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def first_fire(self, now):
+        """Return the first fire time after the scheduler starts"""
+        return now if self.run_on_start else self.next_fire(now, now)
+
+    def next_fire(self, previous, now):
+        """Return the first matching minute strictly after both previous and now"""
+        moment = max(previous, now).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+
+        while moment < limit:
+            if moment.month not in self.months:
+                year = moment.year + (moment.month == 12)
+                month = moment.month % 12 + 1
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+                continue
+            if moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+                continue
+            return moment
+
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+    def __repr__(self):
+        return f"cron '{self.expression}'"
+
+
+def trigger_from_config(job_config):
+    """Build a trigger from a schedule entry in config.json"""
+    run_on_start = job_config.get('run_on_start')
+    if 'cron' in job_config:
+        return CronTrigger(job_config['cron'], run_on_start=bool(run_on_start))
+    interval = job_config.get('interval', 3600)
+    return IntervalTrigger(interval, run_on_start=run_on_start is not False)